@@ -7,7 +7,11 @@ Características principales:
 - Construye la consulta forzando el filtro country:GT y permite acotar por ciudad.
 - Permite añadir filtros adicionales de Shodan (p. ej., port:80, product:"Apache"),
   excluyendo explícitamente el uso de org: según el requisito.
-- Recorre los resultados paginando el endpoint oficial de Shodan Host Search.
+- Recorre los resultados paginando el endpoint oficial de Shodan Host Search;
+  tras la primera página se conoce el total y el resto se descarga en paralelo,
+  respetando una pausa mínima entre el inicio de cada solicitud.
+- Guarda en una caché local (JSON) los campos usados de cada página, para que
+  repetir la misma consulta no vuelva a descargarlas mientras sigan vigentes.
 - Muestra todos los resultados encontrados en una tabla legible por consola.
 - Presenta un resumen con:
     * Total de direcciones IP únicas.
@@ -17,6 +21,7 @@ Características principales:
 Requisitos:
 - Python 3.8 o superior.
 - Paquete requests:  pip install requests
+- Opcional: orjson para decodificar JSON más rápido (pip install orjson).
 
 Endpoint empleado: 
 - https://api.shodan.io/shodan/host/search?key=API_KEY&query=QUERY&facets=FACETS&page=N
@@ -24,13 +29,29 @@ Endpoint empleado:
 
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import os
+import random
+import re
 import sys
+import threading
 import time
-from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, List, Mapping, Optional, Set, Tuple
 from datetime import datetime
-from urllib.parse import urlencode, quote_plus
+from types import MappingProxyType
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson es opcional; json de la biblioteca estándar acepta bytes igual.
+    json_loads = json.loads
 
 
 # ========================
@@ -63,11 +84,72 @@ FACETS: str = ""
 # Límite de resultados a descargar (con paginado).
 MAX_RESULTS: int = 1000
 
-# Pausa entre páginas para evitar límites de la API (segundos).
+# Pausa mínima entre el inicio de dos solicitudes para evitar límites de la API (segundos).
+# Se omite mientras la API informe margen suficiente en X-RateLimit-Remaining.
 SLEEP_SECONDS: float = 1.0
 
+# Resultados que Shodan devuelve por página.
+PAGE_SIZE: int = 100
+
+# Páginas pedidas por adelantado (y descargándose simultáneamente) mientras se
+# procesa la actual. Limita la memoria retenida y las consultas desperdiciadas
+# si el recorrido termina antes.
+PREFETCH_PAGES: int = 2
+
+# Intentos por página ante errores transitorios (429 y 5xx) antes de abortar.
+# Es la única política de reintento por código HTTP: una página que responde
+# siempre 429/5xx hace como máximo HTTP_RETRIES solicitudes.
+HTTP_RETRIES: int = 3
+
+# Espera máxima entre reintentos ante errores 429 (Retry-After) y 5xx (segundos).
+MAX_RETRY_WAIT: float = 30.0
+
+# Caché en disco de las páginas ya descargadas (archivo JSON con total, facetas
+# y los campos mostrados de cada resultado). Dejar como None para desactivarla.
+CACHE_PATH: Optional[str] = ".shodan_cache.json"
+
+# Vigencia de una respuesta en caché (segundos).
+CACHE_TTL_SECONDS: float = 3600.0
+
 # Palabras clave prohibidas en la consulta (según requisito).
 PROHIBITED_KEYWORDS = ["org:"]
+_PROHIBITED_RE = re.compile("|".join(re.escape(k) for k in PROHIBITED_KEYWORDS), re.IGNORECASE)
+
+# Mapeo vacío compartido de solo lectura (no admite asignaciones) para subcampos
+# ausentes como location o _shodan; evita crear un {} nuevo en cada resultado.
+_EMPTY: Mapping[str, object] = MappingProxyType({})
+
+# Tabla de resultados: el diseño de columnas es fijo, así que la cabecera, su
+# subrayado y el formateador de filas se construyen una sola vez al importar.
+# La precisión (.21, .29, ...) recorta cada texto al ancho útil de su columna.
+_ROW_FMT = "{:<18} {:<7} {:<6} {:<22.21} {:<30.29} {:<16.15} {:<18.17} {:<20.19}".format
+_HEADER = _ROW_FMT("IP", "Puerto", "Proto", "Producto", "Hostnames", "Ciudad", "Org", "Fecha")
+_HEADER_RULE = "-" * len(_HEADER)
+
+
+# Sesión HTTP compartida: reutiliza conexiones keep-alive hacia api.shodan.io
+# en lugar de abrir una conexión TCP+TLS nueva por cada página.
+# El adaptador solo reintenta fallos de conexión/lectura (hasta 2 veces más por
+# solicitud); los códigos HTTP (429/5xx) los gestiona únicamente
+# http_get_shodan, por eso no hay status_forcelist ni se respeta Retry-After aquí.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2,
+        connect=2,
+        read=2,
+        status=0,
+        backoff_factor=0.5,
+        respect_retry_after_header=False,
+    ),
+))
+# Respuestas comprimidas: requests las descomprime de forma transparente.
+_SESSION.headers.update({
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "shodan-busqueda/1.0",
+})
 
 
 def build_query() -> str:
@@ -82,18 +164,38 @@ def build_query() -> str:
         base += f' city:"{CITY_FILTER}"'
 
     if ADDITIONAL_FILTERS:
-        low = ADDITIONAL_FILTERS.lower()
-        if any(x in low for x in PROHIBITED_KEYWORDS):
+        if _PROHIBITED_RE.search(ADDITIONAL_FILTERS):
             raise SystemExit("ERROR: El uso de filtros por organización (org:) está prohibido por los requisitos.")
         base = f"{base} {ADDITIONAL_FILTERS}"
     return base.strip()
 
 
-def http_get_shodan(query: str, page: int, facets: str = "") -> dict:
+# Se activa al interrumpir una descarga (p. ej., Ctrl+C): las esperas del
+# limitador y de los reintentos terminan de inmediato en todos los hilos.
+_STOP = threading.Event()
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    """
+    Lee una cabecera numérica (p. ej., Retry-After); None si falta o no es un
+    número finito y no negativo (se descartan "-1", "nan", "inf", etc.).
+    """
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) and number >= 0 else None
+
+
+def http_get_shodan(query: str, page: int, facets: str = "") -> Tuple[dict, Mapping[str, str]]:
     """
     Realiza una solicitud HTTP GET al endpoint de Shodan Host Search.
     Acepta la consulta (query), el número de página y las facetas opcionales.
-    Devuelve el JSON de respuesta como diccionario. Usa exactamente la plantilla:
+    Devuelve el JSON de respuesta como diccionario junto con las cabeceras HTTP
+    (para respetar los límites de la API). Usa exactamente la plantilla:
     https://api.shodan.io/shodan/host/search?key=API_KEY&query=QUERY&facets=FACETS&page=N
     """
     params = {
@@ -104,71 +206,326 @@ def http_get_shodan(query: str, page: int, facets: str = "") -> dict:
     if facets:
         params["facets"] = facets
 
+    # requests codifica los parámetros (espacios como "+"), igual que la plantilla.
     url = "https://api.shodan.io/shodan/host/search"
-    # Se usa urlencode con quote_plus para conservar espacios en filtros complejos
-    full_url = f"{url}?{urlencode(params, quote_via=quote_plus)}"
-
-    resp = requests.get(full_url, timeout=60)
-    if resp.status_code != 200:
-        body = resp.text
-        raise SystemExit(
-            f"ERROR HTTP {resp.status_code} al consultar Shodan.\n"
-            f"URL: {full_url}\n"
-            f"Cuerpo: {body}"
+
+    # Los 429 y 5xx se consideran transitorios: se reintenta respetando
+    # Retry-After (429) o con espera exponencial (5xx) antes de abortar.
+    # Peor caso por página: HTTP_RETRIES solicitudes si falla por código HTTP
+    # (con 5xx, esperas de ~1 s y ~2 s más jitter); si además se mezclan fallos
+    # de conexión, cada intento puede llegar a 3 envíos (adaptador), es decir,
+    # HTTP_RETRIES * 3 = 9 como máximo absoluto.
+    for attempt in range(HTTP_RETRIES):
+        resp = _SESSION.get(url, params=params, timeout=60)
+        if resp.status_code == 200:
+            return json_loads(resp.content), resp.headers
+        if attempt + 1 == HTTP_RETRIES:
+            break
+        if resp.status_code == 429:
+            wait = _header_float(resp.headers, "Retry-After")
+            if _STOP.wait(min(MAX_RETRY_WAIT, 2 ** attempt if wait is None else wait)):
+                break
+        elif resp.status_code >= 500:
+            if _STOP.wait(min(MAX_RETRY_WAIT, 2 ** attempt + random.random())):
+                break
+        else:
+            break
+
+    body = resp.text
+    raise SystemExit(
+        f"ERROR HTTP {resp.status_code} al consultar Shodan.\n"
+        f"URL: {resp.url}\n"
+        f"Cuerpo: {body}"
+    )
+
+
+def _cache_key(query: str, page: int, facets: str) -> str:
+    """
+    Clave de caché: sha256 de la consulta, la página y las facetas.
+    """
+    return hashlib.sha256(f"{query}\0{page}\0{facets}".encode("utf-8")).hexdigest()
+
+
+def cache_load() -> Dict[str, dict]:
+    """
+    Lee el archivo de caché una vez y descarta las entradas vencidas o mal
+    formadas. Se usa JSON (no pickle), así que un archivo ajeno no puede
+    ejecutar código.
+    """
+    if not CACHE_PATH:
+        return {}
+    try:
+        with open(CACHE_PATH, "rb") as fh:
+            entries = json_loads(fh.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        print(f"ADVERTENCIA: No fue posible leer la caché {CACHE_PATH}: {exc}", file=sys.stderr)
+        return {}
+    if not isinstance(entries, dict):
+        return {}
+    now = time.time()
+    return {
+        key: entry for key, entry in entries.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("stored_at"), (int, float))
+        and now - entry["stored_at"] <= CACHE_TTL_SECONDS
+        and isinstance(entry.get("page"), dict)
+    }
+
+
+def cache_save(entries: Dict[str, dict]) -> None:
+    """
+    Escribe la caché completa de una sola vez. Como `entries` proviene de
+    cache_load, las entradas vencidas ya no se vuelven a guardar y el archivo no
+    crece indefinidamente; la escritura es atómica (archivo temporal + os.replace).
+    """
+    if not CACHE_PATH:
+        return
+    tmp_path = f"{CACHE_PATH}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(entries, fh, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_PATH)
+    except (OSError, TypeError, ValueError) as exc:
+        print(f"ADVERTENCIA: No fue posible escribir la caché {CACHE_PATH}: {exc}", file=sys.stderr)
+
+
+class MatchRec:
+    """
+    Registro compacto de un resultado de Shodan con solo los campos que se
+    muestran. Usa __slots__, por lo que no crea un diccionario por instancia.
+    """
+
+    __slots__ = ("ip", "port", "proto", "product", "hostnames", "city", "org", "ts")
+
+    def __init__(self, ip, port, proto, product, hostnames, city, org, ts) -> None:
+        self.ip = ip
+        self.port = port
+        self.proto = proto
+        self.product = product
+        self.hostnames = hostnames
+        self.city = city
+        self.org = org
+        self.ts = ts
+
+    def as_row(self) -> list:
+        """
+        Devuelve los campos en el orden de __slots__ (para guardarlos en la caché).
+        """
+        return [self.ip, self.port, self.proto, self.product,
+                self.hostnames, self.city, self.org, self.ts]
+
+    @classmethod
+    def from_match(cls, m: dict) -> "MatchRec":
+        """
+        Extrae los campos necesarios de un resultado crudo de Shodan (~30 claves,
+        incluido el banner completo); el diccionario original puede liberarse.
+        """
+        return cls(
+            m.get("ip_str") or m.get("ip"),
+            m.get("port"),
+            m.get("transport"),
+            m.get("product") or (m.get("_shodan") or _EMPTY).get("module"),
+            m.get("hostnames"),
+            (m.get("location") or _EMPTY).get("city"),
+            m.get("org"),
+            m.get("timestamp"),
         )
-    return resp.json()
+
+
+class _RateLimiter:
+    """
+    Espacia el inicio de las solicitudes al menos `interval` segundos entre sí.
+    Es seguro entre hilos y no serializa las respuestas que ya están en vuelo.
+    Si la API informa su cuota (X-RateLimit-Remaining / Retry-After), la pausa
+    se ajusta a esas cabeceras en lugar de aplicarse siempre.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._delay = interval
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self) -> None:
+        """
+        Reserva el siguiente turno de inicio y espera hasta que llegue. Si la
+        descarga se interrumpe mientras tanto, aborta con SystemExit.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._delay
+        if _STOP.wait(max(0.0, start - now)):
+            raise SystemExit("Descarga interrumpida.")
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """
+        Ajusta la pausa según X-RateLimit-Remaining y aplaza el siguiente turno
+        lo indicado por Retry-After (como máximo MAX_RETRY_WAIT segundos).
+        """
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        retry_after = _header_float(headers, "Retry-After")
+        with self._lock:
+            # Sin cabeceras de cuota se conserva la pausa configurada.
+            if remaining is not None:
+                self._delay = 0.0 if remaining >= 2 else self._interval
+            if retry_after is not None:
+                self._next = max(self._next, time.monotonic() + min(retry_after, MAX_RETRY_WAIT))
 
 
 def fetch_all(query: str, facets: str, max_results: int, sleep_s: float):
     """
     Descarga resultados de Shodan en varias páginas hasta alcanzar el límite
-    deseado o agotar resultados. Devuelve:
-      - matches: lista de resultados consolidada y sin duplicados (por ip,puerto).
+    deseado o agotar resultados. La primera página indica el total, por lo que
+    las restantes se solicitan en paralelo. Devuelve:
+      - matches: lista de MatchRec consolidada y sin duplicados (por ip,puerto).
       - total_reported: total de resultados informados por Shodan para la consulta.
       - facets_obj: objeto con facetas (si se solicitaron en la primera página).
+      - unique_ips: conjunto de IPs únicas entre los resultados conservados.
+      - port_counts: número de IPs por puerto, contado durante la deduplicación.
     """
-    matches: List[dict] = []
     seen: Set[Tuple[str, int]] = set()
-    page = 1
-    facets_obj: Optional[dict] = None
-
-    first = http_get_shodan(query, page=page, facets=facets)
-    total_reported = int(first.get("total", 0))
-    if first.get("facets"):
-        facets_obj = first["facets"]
-
-    def add_batch(batch: List[dict]) -> int:
+    unique_ips: Set[str] = set()
+    # Cada par (ip, puerto) es único tras deduplicar: basta contar por puerto.
+    port_counts: Counter[int] = Counter()
+    limiter = _RateLimiter(sleep_s)
+    _STOP.clear()
+    # La caché se lee una vez por recorrido y se consulta en memoria; las páginas
+    # nuevas se añaden al diccionario y el archivo se escribe una vez al final.
+    cache = cache_load()
+    cache_dirty = False
+
+    # Cada página se reduce a total, facetas y MatchRec en cuanto se descarga;
+    # solo esa versión reducida se guarda en caché. Las páginas en caché no
+    # consumen consultas a la API ni esperan turno.
+    def get_page(page: int, page_facets: str = "") -> Tuple[int, Optional[dict], List[MatchRec]]:
+        nonlocal cache_dirty
+        key = _cache_key(query, page, page_facets)
+        entry = cache.get(key)
+        if entry is not None:
+            cached = entry["page"]
+            try:
+                recs = [MatchRec(*row) for row in cached["matches"]]
+                return int(cached["total"]), cached.get("facets"), recs
+            except (KeyError, TypeError, ValueError):
+                pass
+        limiter.wait()
+        data, headers = http_get_shodan(query, page=page, facets=page_facets)
+        limiter.observe(headers)
+        total = int(data.get("total", 0))
+        page_facets_obj = data.get("facets") or None
+        recs = [MatchRec.from_match(m) for m in (data.get("matches") or [])]
+        del data
+        if CACHE_PATH:
+            cache[key] = {"stored_at": time.time(), "page": {
+                "total": total,
+                "facets": page_facets_obj,
+                "matches": [r.as_row() for r in recs],
+            }}
+            cache_dirty = True
+        return total, page_facets_obj, recs
+
+    total_reported, facets_obj, first_matches = get_page(1, facets)
+
+    # El total de la primera página indica el tamaño final: se reserva la lista
+    # completa de una vez y se llena por índice en lugar de crecer con append.
+    cap = min(total_reported, max_results)
+    matches: List[Optional[MatchRec]] = [None] * cap
+    n = 0
+
+    def add_batch(batch: List[MatchRec]) -> int:
+        nonlocal n
         added = 0
+        seen_add = seen.add
         for m in (batch or []):
-            ip = m.get("ip_str") or m.get("ip")
-            port = m.get("port")
+            if n >= max_results:
+                break
+            ip = m.ip
+            port = m.port
             key = (str(ip), int(port) if port is not None else -1)
             if key not in seen:
-                seen.add(key)
-                matches.append(m)
+                seen_add(key)
+                # El resumen se agrega aquí, en la misma pasada que deduplica.
+                if ip:
+                    unique_ips.add(str(ip))
+                if port is not None:
+                    try:
+                        port_counts[int(port)] += 1
+                    except (TypeError, ValueError):
+                        pass
+                if n < cap:
+                    matches[n] = m
+                else:
+                    matches.append(m)
+                n += 1
                 added += 1
         return added
 
-    add_batch(first.get("matches", []))
+    add_batch(first_matches)
+    del first_matches
 
-    while len(matches) < max_results and len(matches) < total_reported:
-        page += 1
-        try:
-            data = http_get_shodan(query, page=page)
-        except SystemExit as exc:
-            print(f"ADVERTENCIA: No fue posible continuar en la página {page}: {exc}", file=sys.stderr)
-            break
+    # Cada hilo reduce su página antes de entregarla: las páginas completas
+    # nunca quedan retenidas mientras esperan a ser consumidas.
+    def fetch_page(page: int) -> List[MatchRec]:
+        return get_page(page)[2]
 
-        batch = data.get("matches", [])
-        if not batch:
-            break
+    last_page = min(math.ceil(max_results / PAGE_SIZE), math.ceil(total_reported / PAGE_SIZE))
+    if last_page > 1 and n < max_results:
+        window = max(1, PREFETCH_PAGES)
+        pool = ThreadPoolExecutor(max_workers=window)
+        pages = iter(range(2, last_page + 1))
+        pending: Deque[Tuple[int, Future]] = deque()
 
-        added = add_batch(batch)
-        if added == 0:
-            break
-        time.sleep(sleep_s)
+        def prefetch() -> None:
+            page = next(pages, None)
+            if page is not None:
+                pending.append((page, pool.submit(fetch_page, page)))
 
-    return matches[:max_results], total_reported, facets_obj
+        try:
+            for _ in range(window):
+                prefetch()
+
+            # Productor/consumidor: mientras esta página se deduplica, las
+            # siguientes ya se están descargando. Se consumen en orden de página
+            # para conservar el orden de Shodan. La página siguiente solo se pide
+            # cuando la actual aporta resultados; aun así, si el recorrido se
+            # detiene antes, las PREFETCH_PAGES - 1 páginas que ya estaban en
+            # vuelo se descargan igualmente (cada una consume una consulta).
+            while pending:
+                page, fut = pending.popleft()
+                if n >= max_results:
+                    break
+                try:
+                    batch = fut.result()
+                except SystemExit as exc:
+                    print(f"ADVERTENCIA: No fue posible continuar en la página {page}: {exc}", file=sys.stderr)
+                    break
+
+                if not batch:
+                    break
+
+                added = add_batch(batch)
+                if added == 0:
+                    break
+                if n < max_results:
+                    prefetch()
+        except BaseException:
+            # Ctrl+C u otro error: no se espera a las páginas en vuelo (pueden
+            # estar en una solicitud de hasta 60 s o en una pausa de reintento).
+            _STOP.set()
+            for _, fut in pending:
+                fut.cancel()
+            pool.shutdown(wait=False)
+            raise
+        for _, fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=True)
+
+    if cache_dirty:
+        cache_save(cache)
+    return matches[:n], total_reported, facets_obj, unique_ips, port_counts
 
 
 def normalize(value) -> str:
@@ -221,7 +578,7 @@ def print_facets(facets_obj: Optional[dict]) -> None:
     print()
 
 
-def print_results(results: List[dict]) -> None:
+def print_results(results: List[MatchRec]) -> None:
     """
     Muestra una tabla con los resultados descargados. Las columnas incluyen:
     IP, Puerto, Protocolo, Producto, Hostnames, Ciudad, Org, Fecha.
@@ -230,44 +587,28 @@ def print_results(results: List[dict]) -> None:
         print("No se encontraron resultados para la consulta.")
         return
 
-    header = f"{'IP':<18} {'Puerto':<7} {'Proto':<6} {'Producto':<22} {'Hostnames':<30} {'Ciudad':<16} {'Org':<18} {'Fecha':<20}"
-    print(header)
-    print("-" * len(header))
+    # Se arma la tabla completa y se escribe de una sola vez, en lugar de un
+    # print (y una escritura a stdout) por cada fila.
+    fmt = _ROW_FMT
+    norm = normalize
+    rows = [_HEADER, _HEADER_RULE]
+    rows_append = rows.append
     for m in results:
-        ip = normalize(m.get("ip_str") or m.get("ip"))
-        port = normalize(m.get("port"))
-        proto = normalize(m.get("transport"))
-        product = normalize(m.get("product") or (m.get("_shodan") or {}).get("module"))
-        hostnames = normalize(m.get("hostnames"))[:29]
-        city = normalize((m.get("location") or {}).get("city"))[:15]
-        org = normalize(m.get("org"))[:17]
-        ts = normalize(m.get("timestamp"))[:19]
-
-        line = f"{ip:<18} {port:<7} {proto:<6} {product[:21]:<22} {hostnames:<30} {city:<16} {org:<18} {ts:<20}"
-        print(line)
+        rows_append(fmt(
+            norm(m.ip), norm(m.port), norm(m.proto), norm(m.product),
+            norm(m.hostnames), norm(m.city), norm(m.org), norm(m.ts),
+        ))
+    rows_append("")
+    sys.stdout.write("\n".join(rows))
     print()
 
 
-def print_summary(results: List[dict], student: Dict[str, str]) -> None:
+def print_summary(unique_ips: Set[str], port_counts: Dict[int, int], student: Dict[str, str]) -> None:
     """
-    Calcula e imprime el resumen solicitado: total de IPs únicas y total de IPs por puerto.
+    Imprime el resumen solicitado: total de IPs únicas y total de IPs por puerto.
+    Los totales llegan ya calculados por fetch_all durante la descarga.
     También imprime nuevamente los datos del estudiante al final.
     """
-    unique_ips: Set[str] = set()
-    port_to_ips: Dict[int, Set[str]] = {}
-
-    for m in results:
-        ip = m.get("ip_str") or m.get("ip")
-        if ip:
-            unique_ips.add(str(ip))
-        port = m.get("port")
-        if port is not None:
-            try:
-                p = int(port)
-                port_to_ips.setdefault(p, set()).add(str(ip))
-            except Exception:
-                pass
-
     line = "=" * 90
     print(line)
     print("RESUMEN".center(90))
@@ -275,11 +616,11 @@ def print_summary(results: List[dict], student: Dict[str, str]) -> None:
     print(f"Total de direcciones IP identificadas: {len(unique_ips)}")
     print()
     print("Total de IPs por puerto abierto:")
-    if not port_to_ips:
+    if not port_counts:
         print("  (sin puertos identificados)")
     else:
-        for p, ips in sorted(port_to_ips.items(), key=lambda kv: (-len(kv[1]), kv[0])):
-            print(f"  - Puerto {p:<5} -> {len(ips)} IP(s)")
+        for p, count in sorted(port_counts.items(), key=lambda kv: (-kv[1], kv[0])):
+            print(f"  - Puerto {p:<5} -> {count} IP(s)")
     print()
     print("DATOS DEL ESTUDIANTE")
     print(f"Carnet  : {student['carnet']}")
@@ -299,7 +640,7 @@ def main() -> None:
     final_query = build_query()
     print_banner(STUDENT, final_query)
 
-    results, total_reported, facets_obj = fetch_all(
+    results, total_reported, facets_obj, unique_ips, port_counts = fetch_all(
         query=final_query,
         facets=FACETS,
         max_results=MAX_RESULTS,
@@ -311,7 +652,7 @@ def main() -> None:
 
     print_facets(facets_obj)
     print_results(results)
-    print_summary(results, STUDENT)
+    print_summary(unique_ips, port_counts, STUDENT)
 
 
 if __name__ == "__main__":
@@ -319,4 +660,8 @@ if __name__ == "__main__":
         main()
     except KeyboardInterrupt:
         print("\nEjecución interrumpida por el usuario.", file=sys.stderr)
-        sys.exit(130)
+        # Un hilo de descarga puede seguir bloqueado en una solicitud HTTP y
+        # sys.exit esperaría a que termine; se sale sin esperar a los hilos.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(130)